@@ -9,59 +9,17 @@ import json
 import urllib.request
 import urllib.error
 
-def create_release(token, owner, repo, tag, name, body):
-    """Create a GitHub release using the API"""
-    
-    url = f"https://api.github.com/repos/{owner}/{repo}/releases"
-    
-    payload = {
-        "tag_name": tag,
-        "name": name,
-        "body": body,
-        "draft": False,
-        "prerelease": False
-    }
-    
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "User-Agent": "AI-CLI-Release"
-    }
-    
-    data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers=headers, method='POST')
-    
-    try:
-        with urllib.request.urlopen(req) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            print(f"✅ Release created successfully!")
-            print(f"   Name: {result.get('name')}")
-            print(f"   Tag: {result.get('tag_name')}")
-            print(f"   URL: {result.get('html_url')}")
-            return True
-    except urllib.error.HTTPError as e:
-        error_data = json.loads(e.read().decode('utf-8'))
-        print(f"❌ Error creating release: {error_data.get('message')}")
-        if 'errors' in error_data:
-            for error in error_data['errors']:
-                print(f"   - {error.get('message')}")
-        return False
-    except Exception as e:
-        print(f"❌ Unexpected error: {str(e)}")
-        return False
+try:
+    import urllib3  # optional: pooled keep-alive connections
+except ImportError:
+    urllib3 = None
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 create_release.py <github_token>")
-        print("\nExample:")
-        print("  python3 create_release.py ghp_xxxxxxxxxxxx")
-        print("\nGenerate a token at: https://github.com/settings/tokens")
-        sys.exit(1)
-    
-    token = sys.argv[1]
-    
-    release_body = """## AI CLI v2.4.0.0.1
+OWNER = "minerofthesoal"
+REPO = "ai-cli"
+TAG = "v2.4.0.0.1"
+NAME = "Release v2.4.0.0.1"
+
+RELEASE_BODY = """## AI CLI v2.4.0.0.1
 
 ### Changes
 - ✨ Added AUR (Arch User Repository) package support
@@ -108,22 +66,116 @@ ai canvas new python     # start AI-assisted coding
 ### License
 MIT License
 """
+
+# The payload never changes, so serialise it once at import
+_PAYLOAD = {
+    "tag_name": TAG,
+    "name": NAME,
+    "body": RELEASE_BODY,
+    "draft": False,
+    "prerelease": False
+}
+_BODY = json.dumps(_PAYLOAD).encode('utf-8')
+
+_http = None
+
+def _session():
+    """
+    Return a shared urllib3 PoolManager, or None if urllib3 is unavailable
+    or a proxy is configured — PoolManager ignores HTTPS_PROXY/NO_PROXY,
+    so that case goes through urllib.request, which honours them.
+    """
+    global _http
+    if _http is None and urllib3 is not None and not urllib.request.getproxies():
+        _http = urllib3.PoolManager(maxsize=4)
+    return _http
+
+def _report_success(result):
+    print(f"✅ Release created successfully!")
+    print(f"   Name: {result.get('name')}")
+    print(f"   Tag: {result.get('tag_name')}")
+    print(f"   URL: {result.get('html_url')}")
+    return True
+
+def _report_raw_error(code, raw):
+    print(f"❌ Error creating release: HTTP {code}")
+    print(raw[:512].decode('utf-8', errors='replace'))
+    return False
+
+def _report_error(code, content_type, fp):
+    raw = fp.read()
+    if 'json' not in content_type:
+        # e.g. an HTML 502 page — show it rather than masking it with a JSONDecodeError
+        return _report_raw_error(code, raw)
+    try:
+        error_data = json.loads(raw)   # bytes in, no separate decode pass
+    except ValueError:
+        # Labelled JSON but isn't (e.g. a proxy's HTML error page)
+        return _report_raw_error(code, raw)
+    print(f"❌ Error creating release: {error_data.get('message')}")
+    if 'errors' in error_data:
+        for error in error_data['errors']:
+            print(f"   - {error.get('message')}")
+    return False
+
+def create_release(token, owner=OWNER, repo=REPO, data=_BODY):
+    """Create a GitHub release using the API (data: pre-encoded JSON payload)"""
+    
+    url = f"https://api.github.com/repos/{owner}/{repo}/releases"
+    
+    headers = {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+        "User-Agent": "AI-CLI-Release"
+    }
+    
+    http = _session()
+    if http is not None:
+        try:
+            response = http.request('POST', url, body=data, headers=headers,
+                                    preload_content=False)
+            try:
+                if response.status >= 400:
+                    return _report_error(response.status,
+                                         response.headers.get('Content-Type', ''),
+                                         response)
+                return _report_success(json.load(response))
+            finally:
+                response.release_conn()
+        except Exception as e:
+            print(f"❌ Unexpected error: {str(e)}")
+            return False
+    
+    req = urllib.request.Request(url, data=data, headers=headers, method='POST')
+    
+    try:
+        with urllib.request.urlopen(req) as response:
+            return _report_success(json.load(response))
+    except urllib.error.HTTPError as e:
+        return _report_error(e.code, e.headers.get('Content-Type', ''), e)
+    except Exception as e:
+        print(f"❌ Unexpected error: {str(e)}")
+        return False
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 create_release.py <github_token>")
+        print("\nExample:")
+        print("  python3 create_release.py ghp_xxxxxxxxxxxx")
+        print("\nGenerate a token at: https://github.com/settings/tokens")
+        sys.exit(1)
+    
+    token = sys.argv[1]
     
     print("🚀 Creating GitHub Release...")
-    print("   Owner: minerofthesoal")
-    print("   Repo: ai-cli")
-    print("   Tag: v2.4.0.0.1")
-    print("   Name: Release v2.4.0.0.1")
+    print(f"   Owner: {OWNER}")
+    print(f"   Repo: {REPO}")
+    print(f"   Tag: {TAG}")
+    print(f"   Name: {NAME}")
     print()
     
-    success = create_release(
-        token=token,
-        owner="minerofthesoal",
-        repo="ai-cli",
-        tag="v2.4.0.0.1",
-        name="Release v2.4.0.0.1",
-        body=release_body
-    )
+    success = create_release(token=token)
     
     sys.exit(0 if success else 1)
 
@@ -33,7 +33,7 @@ Options (v3 additions):
     --prefer-branch NAME    Prefer named branch on version tie
     --no-branch-scan        Skip scan; use hardcoded REPO_BRANCH
     --scan-threads N        Parallel scan threads (default: 8)
-    --no-cache              Ignore cached branch scan
+    --no-cache              Ignore cached branch scan / platform detection
     --scan-timeout N        Seconds per branch probe (default: 6)
 
 Options (v2.5 retained):
@@ -57,15 +57,15 @@ import subprocess
 import platform
 import tempfile
 import re
+import shlex
 import argparse
 import json
-import urllib.request
-import urllib.error
+import urllib.parse   # light; pathlib imports it anyway
 import time
 import threading
 from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 # ── Config ────────────────────────────────────────────────────────────────────
 INSTALLER_VERSION = "3.1"
@@ -82,10 +82,23 @@ GH_RAW_BASE      = f"https://raw.githubusercontent.com/{REPO_OWNER}/{REPO_NAME}"
 GH_TREE_API      = f"{GH_API_BASE}/git/trees"
 GH_BRANCHES_API  = f"{GH_API_BASE}/branches?per_page=100&page="
 GH_CONTENTS_API  = f"{GH_API_BASE}/contents"
+GH_CODELOAD_BASE = f"https://codeload.github.com/{REPO_OWNER}/{REPO_NAME}/tar.gz/refs/heads"
 
-BRANCH_CACHE_FILE = Path.home() / ".cache" / "ai-cli" / "branches_v3.json"
+# XDG base for every cache below; an unset *or empty* XDG_CACHE_HOME means ~/.cache
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-cli"
+
+BRANCH_CACHE_FILE = CACHE_DIR / "branches_v3.json"
 BRANCH_CACHE_TTL  = 600   # seconds (10 min)
 
+# ETag + content of the default branch's VERSION file (conditional GET)
+VERSION_CACHE_FILE = CACHE_DIR / "version.etag"
+
+# Detected arch / ARM type / CPU flags, valid until hostname or kernel changes
+PLATFORM_CACHE_FILE = CACHE_DIR / "platform.json"
+
+# Persistent clone for the git fallback — re-runs fetch a delta, not a re-clone
+REPO_CACHE_DIR = CACHE_DIR / "repo"
+
 SEARCH_PATHS = [
     "/usr/local/bin",
     "/usr/bin",
@@ -94,25 +107,47 @@ SEARCH_PATHS = [
     os.path.expanduser("~/bin"),
 ]
 
+# Marker written into the installed script by stamp_version()
+VERSION_STAMP = "# ai-cli-version:"
+
+# Windows .cmd shim that forwards to the bash script (CRLF, as written on Windows)
+_CMD_WRAPPER = b'@echo off\r\nbash "%~dp0' + BINARY_NAME.encode() + b'.sh" %*\r\n'
+
+# Pre-compiled version patterns (hot in sort keys)
+_VER_RE           = re.compile(r"(\d+)\.(\d+)(?:\.(\d+))?")
+_INSTALLED_VER_RE = re.compile(r"v?(\d+)\.(\d+)(?:\.(\d+))?")
+_STAMP_RE         = re.compile(rb"ai-cli-version:\s*v?(\d+)\.(\d+)(?:\.(\d+))?")
+_ARM_SUFFIX_RE    = re.compile(r"-(arm64|arm|aarch64|armv7l)$")
+
+# Arch suffix checks in the script scan: str.endswith(tuple) is a single C
+# call, no regex engine entry per directory entry
+_ARM64_SUFFIXES   = ("-arm64", "-aarch64")
+_ANY_ARM_SUFFIXES = ("-arm64", "-aarch64", "-armv7l")
+
+# Computed once at import — no platform.system() / uname() per call
+_IS_WINDOWS = os.name == "nt" or "MINGW" in os.environ.get("MSYSTEM", "")
+
 # ── Colors ────────────────────────────────────────────────────────────────────
-if sys.stdout.isatty() and platform.system() != "Windows":
+if sys.stdout.isatty() and os.name != "nt":   # MSYS terminals keep ANSI colors
     GRN = "\033[92m"; YLW = "\033[93m"; RED = "\033[91m"
     CYN = "\033[96m"; BLD = "\033[1m";  DIM = "\033[2m"; RST = "\033[0m"
     MAG = "\033[95m"; WHT = "\033[97m"; BLU = "\033[94m"
 else:
     GRN = YLW = RED = CYN = BLD = DIM = RST = MAG = WHT = BLU = ""
 
-def ok(msg):   print(f"{GRN}✓ {msg}{RST}")
-def info(msg): print(f"{CYN}ℹ {msg}{RST}")
-def warn(msg): print(f"{YLW}⚠ {msg}{RST}")
-def err(msg):  print(f"{RED}✗ {msg}{RST}", file=sys.stderr)
-def hdr(msg):  print(f"\n{BLD}{WHT}{msg}{RST}")
-def dim(msg):  print(f"{DIM}  {msg}{RST}")
+# Escape sequences are baked into default args once, at definition time
+def ok(msg,   _p=f"{GRN}✓ ", _s=RST):        print(_p + msg + _s)
+def info(msg, _p=f"{CYN}ℹ ", _s=RST):        print(_p + msg + _s)
+def warn(msg, _p=f"{YLW}⚠ ", _s=RST):        print(_p + msg + _s)
+def err(msg,  _p=f"{RED}✗ ", _s=RST):        sys.stdout.flush(); print(_p + msg + _s, file=sys.stderr)
+def hdr(msg,  _p=f"\n{BLD}{WHT}", _s=RST):   print(_p + msg + _s, flush=True)   # one flush per step
+def dim(msg,  _p=f"{DIM}  ", _s=RST):        print(_p + msg + _s)
 
 # ── Platform helpers ──────────────────────────────────────────────────────────
 def is_windows():
-    return platform.system() == "Windows" or "MINGW" in os.environ.get("MSYSTEM", "")
+    return _IS_WINDOWS
 
+@lru_cache(maxsize=None)
 def is_wsl():
     try:
         with open("/proc/version") as f:
@@ -120,26 +155,49 @@ def is_wsl():
     except OSError:
         return False
 
+@lru_cache(maxsize=None)
 def is_macos():
     return platform.system() == "Darwin"
 
+# euid only changes across setuid, which this installer never does
+_NEED_SUDO = not _IS_WINDOWS and os.geteuid() != 0
+
 def need_sudo():
-    if is_windows():
-        return False
-    return os.geteuid() != 0
+    return _NEED_SUDO
 
-def run(cmd, check=True, capture=False, dry_run=False, timeout=None):
+def run(cmd, check=True, capture=False, dry_run=False, timeout=None, env=None,
+        quiet=False):
     if dry_run:
-        print(f"  {DIM}[dry-run]{RST} {' '.join(str(c) for c in cmd)}")
+        print(f"  {DIM}[dry-run]{RST} {shlex.join(str(c) for c in cmd)}")
         return subprocess.CompletedProcess(cmd, 0, "", "")
     kwargs = {"capture_output": capture, "text": True}
     if timeout:
         kwargs["timeout"] = timeout
+    if env is not None:
+        kwargs["env"] = env
+    if quiet and not capture:
+        # No tty progress writes; stderr kept only to report a failure
+        kwargs["stdout"] = subprocess.DEVNULL
+        kwargs["stderr"] = subprocess.PIPE
+    elif not capture:
+        sys.stdout.flush()   # child writes straight to the fd — keep ordering
+    result = subprocess.run(cmd, **kwargs)
+    if quiet and not capture and result.returncode != 0 and result.stderr:
+        err(result.stderr.strip())
     if check:
-        return subprocess.run(cmd, check=True, **kwargs)
-    return subprocess.run(cmd, **kwargs)
+        result.check_returncode()
+    return result
 
 # ── CPU type detection ────────────────────────────────────────────────────────
+def _read_cpuinfo() -> str:
+    """Whole /proc/cpuinfo in one read(), lower-cased ("" if unavailable)."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            return f.read().lower()
+    except OSError:
+        return ""
+
+@lru_cache(maxsize=None)
 def detect_cpu_features() -> dict:
     feats = {"avx512": False, "avx2": False, "avx": False,
              "sse4_2": False, "neon": False, "sve": False}
@@ -147,37 +205,40 @@ def detect_cpu_features() -> dict:
     arch = platform.machine().lower()
     if arch in ("arm64", "aarch64"):
         feats["neon"] = True
-        try:
-            with open("/proc/cpuinfo") as f:
-                if "sve" in f.read().lower():
-                    feats["sve"] = True
-        except OSError:
-            pass
+        feats["sve"]  = "sve" in _read_cpuinfo()
         return feats
     flags_str = ""
     if system == "Linux":
-        try:
-            with open("/proc/cpuinfo") as f:
-                for line in f:
-                    if line.startswith("flags"):
-                        flags_str = line.split(":", 1)[1].lower()
-                        break
-        except OSError:
-            pass
+        buf = _read_cpuinfo()
+        # First "flags" line, found with str.find instead of per-line iteration
+        start = 0 if buf.startswith("flags") else buf.find("\nflags")
+        if start >= 0:
+            end = buf.find("\n", start + 1)
+            line = buf[start:end] if end >= 0 else buf[start:]
+            flags_str = line.partition(":")[2]
     elif system == "Darwin":
         try:
+            # Runs once per kernel release — the result lands in PLATFORM_CACHE_FILE
             r = subprocess.run(["sysctl", "-n", "machdep.cpu.features",
                                  "machdep.cpu.leaf7_features"],
-                                capture_output=True, text=True, timeout=3)
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, timeout=3)
             flags_str = r.stdout.lower()
         except Exception:
             pass
     elif system == "Windows":
+        # cpufeature: C extension, ~1 ms import. py-cpuinfo is the slow
+        # fallback (spawns a probe subprocess). Both imported only here.
         try:
-            import cpuinfo  # type: ignore
-            flags_str = " ".join(cpuinfo.get_cpu_info().get("flags", []))
+            import cpufeature  # type: ignore
+            flags_str = " ".join(k.lower() for k, v in cpufeature.CPUFeature.items()
+                                 if v is True)   # skip vendor/count entries
         except Exception:
-            pass
+            try:
+                import cpuinfo  # type: ignore
+                flags_str = " ".join(cpuinfo.get_cpu_info().get("flags", []))
+            except Exception:
+                pass
     feats["avx512"] = "avx512f" in flags_str or "avx512" in flags_str
     feats["avx2"]   = "avx2" in flags_str
     feats["avx"]    = "avx " in flags_str or flags_str.startswith("avx")
@@ -192,6 +253,7 @@ def cpu_tier(feats: dict) -> str:
     return "baseline"
 
 # ── Architecture detection ────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
 def detect_arch() -> str:
     machine = platform.machine().lower()
     if machine in ("x86_64", "amd64"):   return "x86_64"
@@ -199,48 +261,123 @@ def detect_arch() -> str:
     if machine.startswith("armv7"):      return "armv7l"
     return machine or "unknown"
 
+# (substring, arm_type) — first hit wins, checked against each probe below
+_ARM_SIGS = (("raspberry pi", "raspberry_pi"), ("jetson", "jetson"), ("tegra", "jetson"))
+
+def _read_model(path: str) -> str:
+    try:
+        with open(path, "rb") as f:
+            return f.read(4096).decode("utf-8", errors="replace").lower()
+    except OSError:
+        return ""
+
+@lru_cache(maxsize=None)
 def detect_arm_type() -> str:
     if is_macos():
         return "apple_silicon"
-    model_str = ""
-    for path in ("/proc/device-tree/model", "/sys/firmware/devicetree/base/model"):
-        try:
-            with open(path, "rb") as f:
-                model_str = f.read().decode("utf-8", errors="replace").strip("\x00")
-            break
-        except OSError:
-            pass
-    if "raspberry pi" in model_str.lower(): return "raspberry_pi"
-    if "nvidia jetson" in model_str.lower(): return "jetson"
+    if Path("/etc/nv_tegra_release").exists():
+        return "jetson"
+    # Priority-ordered probes; on most boards the first read decides.
+    # cpuinfo is read whole: its "Model"/"Hardware" lines come after the cores.
+    probes = (
+        lambda: _read_model("/proc/device-tree/model"),
+        lambda: _read_model("/sys/firmware/devicetree/base/model"),
+        _read_cpuinfo,
+    )
+    for probe in probes:
+        data = probe()
+        label = next((lbl for sig, lbl in _ARM_SIGS if sig in data), None)
+        if label:
+            return label
+    # jetson-stats tool: fixed allow-list instead of walking a (WSL-long) PATH
+    if any(Path(d, "jetson_release").exists() for d in ("/usr/bin", "/usr/local/bin", "/opt/bin")):
+        return "jetson"
+    return "generic_arm64"
+
+# ── Platform detection cache ──────────────────────────────────────────────────
+def _platform_cache_key() -> str:
+    # A kernel upgrade, a copied home dir on another host, or a new installer
+    # (which may detect differently) invalidates it
+    return f"{INSTALLER_VERSION}|{platform.node()}|{platform.release()}"
+
+def _load_platform_cache():
+    """Return cached {"arch", "arm_type", "cpu_feats"} or None if stale/missing."""
     try:
-        with open("/proc/cpuinfo") as f:
-            cpuinfo = f.read().lower()
-        if "tegra" in cpuinfo or "jetson" in cpuinfo:
-            return "jetson"
-    except OSError:
+        cached = json.loads(PLATFORM_CACHE_FILE.read_text())
+        plat   = cached.get("platform")
+        if (cached.get("key") == _platform_cache_key()
+                and isinstance(plat, dict)
+                and all(k in plat for k in ("arch", "arm_type", "cpu_feats"))
+                and isinstance(plat["cpu_feats"], dict)):
+            return plat
+    except Exception:
+        pass
+    return None
+
+def _save_platform_cache(plat: dict):
+    try:
+        PLATFORM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PLATFORM_CACHE_FILE.write_text(json.dumps(
+            {"key": _platform_cache_key(), "platform": plat}, indent=2))
+    except Exception:
         pass
-    if Path("/etc/nv_tegra_release").exists(): return "jetson"
-    if shutil.which("jetson_release"):         return "jetson"
-    return "generic_arm64"
+
+def detect_platform(no_cache=False) -> dict:
+    """arch / arm_type / cpu_feats — from the on-disk cache when fresh."""
+    plat = None if no_cache else _load_platform_cache()
+    if plat is None:
+        arch = detect_arch()
+        plat = {
+            "arch":      arch,
+            "arm_type":  detect_arm_type() if arch == "arm64" else "",
+            "cpu_feats": detect_cpu_features(),
+        }
+        _save_platform_cache(plat)
+    return plat
+
+_ARM64_LABELS = {
+    "apple_silicon": "ARM64 — Apple Silicon (M1/M2/M3/M4+)",
+    "jetson":        "ARM64 — NVIDIA Jetson (CUDA)",
+    "raspberry_pi":  "ARM64 — Raspberry Pi",
+    "generic_arm64": "ARM64 — Generic aarch64",
+}
 
 def arch_label(arch: str, arm_type: str, cpu_feats: dict = None) -> str:
     if arch == "x86_64":
         tier = cpu_tier(cpu_feats) if cpu_feats else "unknown"
         return f"x86_64 (Intel/AMD) — CPU tier: {tier}"
     if arch == "arm64":
-        labels = {
-            "apple_silicon": "ARM64 — Apple Silicon (M1/M2/M3/M4+)",
-            "jetson":        "ARM64 — NVIDIA Jetson (CUDA)",
-            "raspberry_pi":  "ARM64 — Raspberry Pi",
-            "generic_arm64": "ARM64 — Generic aarch64",
-        }
-        return labels.get(arm_type, f"ARM64 — {arm_type}")
+        return _ARM64_LABELS.get(arm_type) or f"ARM64 — {arm_type}"
     return arch
 
 # ── Version parsing ───────────────────────────────────────────────────────────
+def _fast_parse_version(name: str):
+    """
+    Regex-free path for the common 'main-vX.Y[.Z]' shape. Returns None for
+    anything else so parse_version() can fall back to the regex.
+    """
+    if not name.startswith(VERSION_GLOB):
+        return None
+    parts = name[len(VERSION_GLOB):].split(".")
+    if not 2 <= len(parts) <= 3:
+        return None
+    for part in parts:
+        if not (part.isascii() and part.isdigit()):
+            return None
+    return (int(parts[0]), int(parts[1]), int(parts[2]) if len(parts) == 3 else 0)
+
 def parse_version(name: str) -> tuple:
-    clean = re.sub(r"-(arm64|arm|aarch64|armv7l)$", "", name)
-    m = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", clean)
+    return _parse_version_cached(name)
+
+# Same filenames are parsed by the scan, find_script_for_arch and
+# get_latest_repo_version — parse each one once per process.
+@lru_cache(maxsize=512)
+def _parse_version_cached(name: str) -> tuple:
+    clean = _ARM_SUFFIX_RE.sub("", name)
+    fast = _fast_parse_version(clean)
+    if fast is not None:
+        return fast
+    m = _VER_RE.search(clean)
     if not m:
         return (0, 0, 0)
     return (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
@@ -249,17 +386,23 @@ def version_str(tup: tuple) -> str:
     return ".".join(str(x) for x in tup)
 
 def find_script_for_arch(repo_dir: Path, arch: str) -> Path:
-    all_scripts = [
-        p for p in repo_dir.iterdir()
-        if p.name.startswith(VERSION_GLOB) and p.is_file()
-    ]
+    # One scandir pass partitions by arch; is_file() uses the cached dirent
+    # type, so there is no per-entry stat()
+    all_scripts, arm64_scripts, generic_scripts = [], [], []
+    with os.scandir(repo_dir) as it:
+        for e in it:
+            if not e.name.startswith(VERSION_GLOB) or not e.is_file(follow_symlinks=False):
+                continue
+            p = Path(e.path)
+            all_scripts.append(p)
+            if e.name.endswith(_ARM64_SUFFIXES):
+                arm64_scripts.append(p)
+            elif not e.name.endswith(_ANY_ARM_SUFFIXES):
+                generic_scripts.append(p)
     if not all_scripts:
         raise FileNotFoundError(
             f"No 'main-v*' script found in {repo_dir}. Check the repo branch."
         )
-    arm64_scripts   = [p for p in all_scripts if re.search(r"-(arm64|aarch64)$", p.name)]
-    generic_scripts = [p for p in all_scripts
-                       if not re.search(r"-(arm64|aarch64|armv7l)$", p.name)]
     if arch == "arm64" and arm64_scripts:
         candidates = arm64_scripts
         info(f"ARM64-specific builds: {[p.name for p in candidates]}")
@@ -267,41 +410,90 @@ def find_script_for_arch(repo_dir: Path, arch: str) -> Path:
         if arch == "arm64":
             warn("No arm64-specific build found — using generic script")
         candidates = generic_scripts or all_scripts
-    best = sorted(candidates, key=lambda p: parse_version(p.name), reverse=True)[0]
+    # Single O(N) pass — we only need the top entry, not a full sort
+    best = max(candidates, key=lambda p: parse_version(p.name))
     info(f"Selected build: {best.name}")
     return best
 
 # ── Installed version detection ───────────────────────────────────────────────
+def _install_names() -> tuple:
+    if is_windows():
+        return (BINARY_NAME,) + tuple(BINARY_NAME + ext for ext in (".cmd", ".bat", ".exe", ".sh"))
+    return (BINARY_NAME,)
+
+def _scan_path(sp: str) -> list:
+    """
+    POSIX probes a single name, so one stat() is cheapest. Windows probes
+    five — one directory listing matched case-insensitively beats a stat()
+    per candidate name.
+    """
+    if not is_windows():
+        p = os.path.join(sp, BINARY_NAME)
+        return [p] if os.path.exists(p) else []
+    wanted = {n.lower(): i for i, n in enumerate(_install_names())}
+    hits = []
+    try:
+        with os.scandir(sp) as it:
+            for e in it:
+                rank = wanted.get(e.name.lower())
+                if rank is not None:
+                    hits.append((rank, e.path))
+    except OSError:
+        return []
+    return [path for _, path in sorted(hits)]
+
 def find_existing_installs() -> list:
     found = []
-    which_cmd = "where" if is_windows() else "which"
-    try:
-        result = run([which_cmd, BINARY_NAME], capture=True, check=False)
-        if result.returncode == 0:
-            for line in result.stdout.strip().splitlines():
-                p = Path(line.strip())
-                if p.exists() and str(p) not in found:
-                    found.append(str(p))
-    except Exception:
-        pass
-    for sp in SEARCH_PATHS:
-        p = Path(sp) / BINARY_NAME
-        if p.exists() and str(p) not in found:
-            found.append(str(p))
-        if is_windows():
-            for ext in (".cmd", ".bat", ".exe"):
-                pw = p.with_suffix(ext)
-                if pw.exists() and str(pw) not in found:
-                    found.append(str(pw))
+    seen  = set()
+    def add(p):
+        p = os.path.normpath(p)
+        if p not in seen:
+            seen.add(p); found.append(p)
+    # PATH lookup first — its hit is the install that actually runs. Done
+    # in-process with shutil.which, no `which` / `where` fork+exec
+    names = [BINARY_NAME]
+    if is_windows():
+        names += [BINARY_NAME + ext for ext in
+                  os.environ.get("PATHEXT", "").split(os.pathsep) if ext]
+    for name in names:
+        hit = shutil.which(name)
+        if hit:
+            add(hit)
+    # Directory probes are I/O-bound (slow on NFS / OneDrive homes) — scan concurrently
+    with ThreadPoolExecutor(max_workers=len(SEARCH_PATHS)) as pool:
+        per_dir = list(pool.map(_scan_path, SEARCH_PATHS))
+    for hits in per_dir:
+        for p in hits:
+            add(p)
     return found
 
+def detect_installed_versions(paths: list) -> list:
+    """Run detect_installed_version() over every path concurrently, order kept."""
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+        return list(pool.map(detect_installed_version, paths))
+
 def detect_installed_version(path: str) -> tuple:
+    # Installs made by this installer carry a version stamp near the top —
+    # a short read() instead of a fork+exec of `ai version`
+    try:
+        with open(path, "rb") as f:
+            m = _STAMP_RE.search(f.read(512))
+        if m:
+            return (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
+    except OSError:
+        pass
     try:
+        # Timeout bounds a hung/broken install but leaves room for the ~1 MB
+        # bash script to start on a Pi/Jetson; DEVNULL stdin so the child
+        # can't block on input; close_fds=False skips Windows' handle-closing loop.
         result = subprocess.run(
-            [path, "version"], capture_output=True, text=True, timeout=8
+            [path, "version"], capture_output=True, text=True, timeout=8,
+            stdin=subprocess.DEVNULL, close_fds=(os.name != "nt"),
         )
         text = (result.stdout + result.stderr).strip()
-        m = re.search(r"v?(\d+)\.(\d+)(?:\.(\d+))?", text)
+        m = _INSTALLED_VER_RE.search(text)
         if m:
             return (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
     except Exception:
@@ -317,23 +509,41 @@ def get_latest_repo_version(repo_dir: Path, arch: str) -> tuple:
 
 # ── Uninstall ─────────────────────────────────────────────────────────────────
 def uninstall(paths: list, dry_run=False):
+    sudo_paths = []
     for p in paths:
         try:
             if dry_run:
                 warn(f"[dry-run] Would remove: {p}"); continue
-            if need_sudo() and not Path(p).stat().st_mode & 0o200:
-                run(["sudo", "rm", "-f", p])
-            else:
-                os.remove(p)
+            if _NEED_SUDO and not Path(p).stat().st_mode & 0o200:
+                sudo_paths.append(p); continue
+            os.remove(p)
             ok(f"Removed: {p}")
         except PermissionError:
             warn(f"Retrying with sudo: {p}")
-            if not dry_run:
-                run(["sudo", "rm", "-f", p], check=False)
+            sudo_paths.append(p)
         except Exception as exc:
             warn(f"Could not remove {p}: {exc}")
+    if sudo_paths:
+        # One sudo (one PAM prompt, one fork) for every privileged removal
+        result = run(["sudo", "rm", "-f", *sudo_paths], check=False)
+        for p in sudo_paths:
+            if result.returncode == 0:
+                ok(f"Removed: {p}")
+            else:
+                warn(f"Could not remove {p}: sudo rm exited {result.returncode}")
 
 # ── Clone / fetch ─────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def _git_version() -> tuple:
+    try:
+        r = subprocess.run(["git", "--version"], capture_output=True, text=True, timeout=5)
+        m = _VER_RE.search(r.stdout)
+        if m:
+            return (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
+    except Exception:
+        pass
+    return (0, 0, 0)
+
 def clone_repo(dest: Path, branch: str, dry_run=False):
     if not shutil.which("git"):
         raise EnvironmentError(
@@ -342,40 +552,195 @@ def clone_repo(dest: Path, branch: str, dry_run=False):
             "  Ubuntu: sudo apt install git\n"
             "  macOS:  brew install git"
         )
-    cmd = ["git", "clone", "--depth=1", "--branch", branch, REPO_URL, str(dest)]
+    # Shallow, single-branch, tag-less partial clone: we only read one main-v*
+    # file and updates are --depth=1 fetches too, so it is never re-deepened.
+    # --no-checkout + sparse-checkout means only main-v* / VERSION blobs are
+    # ever fetched (sparse-checkout needs git >= 2.25).
+    # protocol v2: server filters the ref advertisement to just this branch
+    sparse = _git_version() >= (2, 25, 0)
+    cmd = ["git", "-c", "protocol.version=2", "clone", "--quiet", "--depth=1",
+           "--single-branch", "--no-tags", "--filter=blob:none"]
+    if sparse:
+        cmd.append("--no-checkout")
+    cmd += ["--branch", branch, REPO_URL, str(dest)]
+    # GIT_TERMINAL_PROMPT=0: fail fast instead of hanging on a credential prompt
+    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0",
+           # also via env so the follow-up sparse-checkout/checkout fetches use v2
+           "GIT_CONFIG_COUNT": "1", "GIT_CONFIG_KEY_0": "protocol.version",
+           "GIT_CONFIG_VALUE_0": "2"}
+    if (dest / ".git").is_dir():
+        # Cached clone: an incremental shallow fetch only transfers new objects
+        info(f"Updating cached clone {dest} @ {branch} …")
+        try:
+            run(["git", "-C", str(dest), "fetch", "--depth=1", "--no-tags",
+                 "origin", branch], dry_run=dry_run, env=env, quiet=True)
+            run(["git", "-C", str(dest), "reset", "--hard", "FETCH_HEAD"],
+                dry_run=dry_run, env=env, quiet=True)
+            return
+        except subprocess.CalledProcessError:
+            warn("Cached clone is unusable — re-cloning …")
+            shutil.rmtree(dest, ignore_errors=True)
     info(f"Cloning {REPO_URL} @ {branch} …")
-    run(cmd, dry_run=dry_run)
+    if not dry_run:
+        if dest.exists():   # leftovers of an interrupted clone
+            shutil.rmtree(dest, ignore_errors=True)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+    run(cmd, dry_run=dry_run, env=env, quiet=True)
+    if not sparse:
+        return
+    # Non-cone patterns: cone mode only matches directories, not file globs.
+    # Non-cone is the default before git 2.35, which lacks the --no-cone flag.
+    set_cmd = ["git", "-C", str(dest), "sparse-checkout", "set"]
+    if _git_version() >= (2, 35, 0):
+        set_cmd.append("--no-cone")
+    run(set_cmd + ["/main-v*", "/VERSION"], dry_run=dry_run, env=env, quiet=True)
+    run(["git", "-C", str(dest), "checkout", branch],
+        dry_run=dry_run, env=env, quiet=True)
+
+def tarball_url(branch: str) -> str:
+    return f"{GH_CODELOAD_BASE}/{urllib.parse.quote(branch, safe='/')}"
+
+def fetch_tarball(dest: Path, branch: str, dry_run=False, stop=None):
+    """
+    Stream the branch tarball from codeload and extract only the top-level
+    main-v* scripts into dest — no git, no pack negotiation, no checkout.
+    Raises urllib.error.HTTPError (e.g. 404) if the tarball is unavailable.
+    Prints nothing (safe to run off the main thread); setting the optional
+    `stop` event abandons the extraction.
+    """
+    import tarfile
+    import urllib.request
+    url = tarball_url(branch)
+    if dry_run:
+        print(f"  {DIM}[dry-run]{RST} GET {url}")
+        return
+    dest.mkdir(parents=True, exist_ok=True)
+    req = urllib.request.Request(url, headers={
+        "Accept-Encoding": "identity",   # payload is already gzip
+        "User-Agent": f"ai-cli-installer/{INSTALLER_VERSION}",
+    })
+    # Explicit filter silences the 3.12/3.13 DeprecationWarning; older
+    # interpreters lack it (the member checks below already restrict paths)
+    extract_kw = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        # "r|gz" = streaming mode: constant memory, single forward pass
+        with tarfile.open(fileobj=resp, mode="r|gz") as tar:
+            for member in tar:
+                if stop is not None and stop.is_set():
+                    return
+                parts = member.name.split("/")
+                # Only <archive-root>/main-v* — never nested paths
+                if (len(parts) != 2 or not member.isfile()
+                        or not parts[1].startswith(VERSION_GLOB)):
+                    continue
+                member.name = parts[1]
+                tar.extract(member, dest, **extract_kw)
+
+def fetch_sources(dest: Path, branch: str, dry_run=False, pending=None) -> Path:
+    """
+    Tarball into dest first; git clone only when codeload has no such branch.
+    `pending` is a Future already running fetch_tarball(dest, branch) in the
+    background — it is joined here so all output comes from the main thread.
+    Returns the directory holding the main-v* scripts (dest, or the cached
+    clone in REPO_CACHE_DIR for the git fallback).
+    """
+    import urllib.error
+    info(f"Downloading {tarball_url(branch)} …")
+    try:
+        if pending is not None:
+            pending.result()
+        else:
+            fetch_tarball(dest, branch=branch, dry_run=dry_run)
+        return dest
+    except urllib.error.HTTPError as e:
+        if e.code != 404:
+            raise
+        warn("Tarball not available — falling back to git clone …")
+        clone_repo(REPO_CACHE_DIR, branch=branch, dry_run=dry_run)
+        return REPO_CACHE_DIR
+
+def start_background(fn, *args, **kwargs) -> Future:
+    """
+    Run fn on a daemon thread and return its Future. Unlike a
+    ThreadPoolExecutor worker, a daemon thread is not joined at interpreter
+    exit, so Ctrl-C never waits on an in-flight download.
+    """
+    fut = Future()
+    def work():
+        if not fut.set_running_or_notify_cancel():
+            return
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            fut.set_exception(exc)
+    threading.Thread(target=work, daemon=True).start()
+    return fut
 
 def fetch_latest_branch(repo_dir: Path, branch: str, dry_run=False):
     run(["git", "-C", str(repo_dir), "fetch", "--depth=1", "origin", branch],
-        dry_run=dry_run, check=False)
+        dry_run=dry_run, check=False, quiet=True)
     run(["git", "-C", str(repo_dir), "reset", "--hard", f"origin/{branch}"],
-        dry_run=dry_run, check=False)
+        dry_run=dry_run, check=False, quiet=True)
+    if (repo_dir / ".git" / "info" / "sparse-checkout").exists():
+        run(["git", "-C", str(repo_dir), "sparse-checkout", "reapply"],
+            dry_run=dry_run, check=False, quiet=True)
 
 # ── Install ───────────────────────────────────────────────────────────────────
-def install_script(script: Path, prefix: Path, dry_run=False) -> Path:
+def stamp_version(script: Path, version: tuple) -> Path:
+    """
+    Temp copy of script with a '# ai-cli-version: X.Y.Z' line after the
+    shebang, so detect_installed_version() can read it instead of running ai.
+    Written outside the repo dir so it is never mistaken for a main-v* build.
+    """
+    data = script.read_bytes()
+    stamp = f"{VERSION_STAMP} {version_str(version)}\n".encode()
+    if data.startswith(b"#!"):
+        nl = data.find(b"\n") + 1 or len(data)
+        data = data[:nl] + stamp + data[nl:]
+    else:
+        data = stamp + data
+    fd, tmp = tempfile.mkstemp(prefix="ai-cli-stamped-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    shutil.copystat(script, tmp)
+    return Path(tmp)
+
+def install_script(script: Path, prefix: Path, dry_run=False, version=None) -> Path:
     bin_dir = prefix / "bin"
     dest    = bin_dir / BINARY_NAME
     if is_windows():
         dest = bin_dir / f"{BINARY_NAME}.sh"
     if not dry_run:
         bin_dir.mkdir(parents=True, exist_ok=True)
-    if need_sudo():
+    stamped = None
+    if version and not dry_run:
+        stamped = script = stamp_version(script, version)
+    try:
+        _copy_script(script, dest, dry_run=dry_run)
+    finally:
+        if stamped:
+            stamped.unlink(missing_ok=True)
+    if is_windows() and not dry_run:
+        cmd_wrapper = bin_dir / f"{BINARY_NAME}.cmd"
+        cmd_wrapper.write_bytes(_CMD_WRAPPER)
+        ok(f"Windows wrapper: {cmd_wrapper}")
+    return dest
+
+def _copy_script(script: Path, dest: Path, dry_run=False):
+    if _NEED_SUDO:
         info(f"Installing to {dest} (sudo required)…")
-        run(["sudo", "cp", str(script), str(dest)], dry_run=dry_run)
-        run(["sudo", "chmod", "+x", str(dest)], dry_run=dry_run)
+        # install(1) copies and sets the mode in one privileged exec
+        run(["sudo", "install", "-m", "755", str(script), str(dest)],
+            dry_run=dry_run)
     else:
         if dry_run:
             info(f"[dry-run] Would copy {script.name} → {dest}")
         else:
+            # copy2 keeps the source mode, so derive the target mode up front
+            mode = script.stat().st_mode | 0o755
             shutil.copy2(script, dest)
-            dest.chmod(dest.stat().st_mode | 0o755)
+            os.chmod(dest, mode)
         ok(f"Installed: {dest}")
-    if is_windows() and not dry_run:
-        cmd_wrapper = bin_dir / f"{BINARY_NAME}.cmd"
-        cmd_wrapper.write_text(f'@echo off\nbash "%~dp0{BINARY_NAME}.sh" %*\n')
-        ok(f"Windows wrapper: {cmd_wrapper}")
-    return dest
 
 # ── Deps ──────────────────────────────────────────────────────────────────────
 def run_install_deps(ai_bin: Path, cpu_only=False, arm_type="",
@@ -387,8 +752,9 @@ def run_install_deps(ai_bin: Path, cpu_only=False, arm_type="",
         cmd.append("--jetson")
     elif arm_type in ("raspberry_pi", "generic_arm64"):
         cmd.append("--cpu-only")
-    info("Running: " + " ".join(cmd))
+    info("Running: " + shlex.join(cmd))
     if not dry_run:
+        sys.stdout.flush()
         proc = subprocess.Popen(cmd, stdout=sys.stdout, stderr=sys.stderr)
         proc.wait()
         if proc.returncode != 0:
@@ -402,6 +768,9 @@ def run_install_deps(ai_bin: Path, cpu_only=False, arm_type="",
 
 def _gh_api(url: str, timeout: int = 8) -> object:
     """Fetch GitHub API endpoint, return parsed JSON or None."""
+    # Lazy: urllib.request pulls in ssl / http.client / email (~15-20 ms cold)
+    import urllib.request
+    import urllib.error
     req = urllib.request.Request(url, headers={"Accept": "application/vnd.github+json",
                                                 "User-Agent": f"ai-cli-installer/{INSTALLER_VERSION}"})
     token = os.environ.get("GITHUB_TOKEN", "")
@@ -476,9 +845,6 @@ def _probe_branch_for_scripts(branch: str, timeout: int = 6) -> dict:
         result["best_ver"] = parse_version(best)
     return result
 
-# Make sure urllib.parse is imported
-import urllib.parse
-
 def progress_bar(current: int, total: int, width: int = 30,
                  label: str = "") -> str:
     pct = current / total if total else 0
@@ -598,17 +964,52 @@ def check_remote_version(arch: str) -> tuple:
     except Exception:
         pass
     # Fallback: VERSION file on default branch
-    raw_url = f"{GH_RAW_BASE}/{REPO_BRANCH}/VERSION"
     try:
-        with urllib.request.urlopen(raw_url, timeout=5) as resp:
-            content = resp.read().decode().strip()
-            m = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", content)
-            if m:
-                return (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
+        content = _fetch_version_file(timeout=5)
+        m = _VER_RE.search(content or "")
+        if m:
+            return (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
     except Exception:
         pass
     return (0, 0, 0)
 
+def _fetch_version_file(timeout: int = 5):
+    """
+    Conditional GET of VERSION on the default branch. The ETag is cached in
+    VERSION_CACHE_FILE, so an unchanged file costs a body-less 304.
+    Returns the file content, or None on failure.
+    """
+    import http.client
+    try:
+        cached = json.loads(VERSION_CACHE_FILE.read_text())
+    except Exception:
+        cached = {}
+    if not isinstance(cached, dict):
+        cached = {}
+    raw = urllib.parse.urlsplit(GH_RAW_BASE)
+    headers = {"User-Agent": f"ai-cli-installer/{INSTALLER_VERSION}"}
+    if cached.get("etag") and "version" in cached:
+        headers["If-None-Match"] = cached["etag"]
+    conn = http.client.HTTPSConnection(raw.netloc, timeout=timeout)
+    try:
+        conn.request("GET", f"{raw.path}/{REPO_BRANCH}/VERSION", headers=headers)
+        resp = conn.getresponse()
+        if resp.status == 304:
+            return cached["version"]
+        if resp.status != 200:
+            return None
+        content = resp.read().decode().strip()
+    finally:
+        conn.close()
+    try:
+        VERSION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        VERSION_CACHE_FILE.write_text(json.dumps({
+            "etag": resp.getheader("ETag", ""), "version": content,
+            "mtime": time.time()}))
+    except Exception:
+        pass
+    return content
+
 # ── List-branches display ─────────────────────────────────────────────────────
 def cmd_list_branches(scan_results: list, arch: str):
     """Print a formatted table of all branches with their available versions."""
@@ -657,7 +1058,7 @@ def main():
     parser.add_argument("--scan-threads",   type=int, default=8,
                         help="Parallel threads for branch scan (default: 8)")
     parser.add_argument("--no-cache",       action="store_true",
-                        help="Ignore cached branch scan results")
+                        help="Ignore cached branch scan / platform detection")
     parser.add_argument("--scan-timeout",   type=int, default=6,
                         help="Seconds per branch probe (default: 6)")
     # v2.5 retained
@@ -689,11 +1090,12 @@ def main():
     prefix = Path(args.prefix).expanduser().resolve()
 
     # ── Detect platform ────────────────────────────────────────────────────────
-    arch     = args.arch or detect_arch()
+    plat     = detect_platform(no_cache=args.no_cache)
+    arch     = args.arch or plat["arch"]
     arm_type = args.arm_type or ("jetson" if args.jetson else "")
     if arch == "arm64" and not arm_type:
-        arm_type = detect_arm_type()
-    cpu_feats = detect_cpu_features()
+        arm_type = plat["arm_type"] or detect_arm_type()
+    cpu_feats = plat["cpu_feats"]
 
     # ── Banner ─────────────────────────────────────────────────────────────────
     hdr(f"╔══ AI CLI Installer v{INSTALLER_VERSION} ══╗")
@@ -755,58 +1157,72 @@ def main():
         cmd_list_branches(scan_results, arch)
         sys.exit(0)
 
-    # ── 1. Check existing install ─────────────────────────────────────────────
-    hdr("Step 1 — Checking existing installation…")
-    existing      = find_existing_installs()
-    installed_ver = (0, 0, 0)
-    installed_path = None
-
-    if existing:
-        installed_path = existing[0]
-        installed_ver  = detect_installed_version(installed_path)
-        info(f"Found: {installed_path}  (version: {version_str(installed_ver)})")
-    else:
-        ok("No existing install found — fresh install.")
+    tmp_dir    = None
+    fetch_job  = None
+    fetch_stop = threading.Event()
+    try:
+        if not args.check:
+            tmp_dir    = Path(tempfile.mkdtemp(prefix="ai-cli-install-"))
+            clone_dest = tmp_dir / "ai-cli"
+        # ── Start fetching in the background ──────────────────────────────────
+        # The download is network-bound and independent of Step 1's local
+        # probes, so overlap the two; Step 2 joins it and does all the
+        # printing. Dry-run stays sequential to keep its output ordered.
+        if not args.check and not dry:
+            fetch_job = start_background(fetch_tarball, clone_dest,
+                                         selected_branch, stop=fetch_stop)
+
+        # ── 1. Check existing install ─────────────────────────────────────────
+        hdr("Step 1 — Checking existing installation…")
+        existing      = find_existing_installs()
+        installed_ver = (0, 0, 0)
+        installed_path = None
 
-    # ── --check mode ──────────────────────────────────────────────────────────
-    if args.check:
-        hdr("Version check (remote)…")
-        if scan_results:
-            remote_ver = scan_results[0]["best_ver"]
-            remote_branch = scan_results[0]["branch"]
+        if existing:
+            versions       = detect_installed_versions(existing)
+            installed_path = existing[0]
+            installed_ver  = versions[0]
+            for p, v in zip(existing, versions):
+                info(f"Found: {p}  (version: {version_str(v)})")
         else:
-            remote_ver    = check_remote_version(arch)
-            remote_branch = selected_branch
-        if remote_ver > (0, 0, 0):
-            if remote_ver > installed_ver:
-                warn(f"Update available: {version_str(installed_ver)} → "
-                     f"{version_str(remote_ver)}  [{remote_branch}]")
-                warn("Run: python3 install.py --update")
+            ok("No existing install found — fresh install.")
+
+        # ── --check mode ──────────────────────────────────────────────────────
+        if args.check:
+            hdr("Version check (remote)…")
+            if scan_results:
+                remote_ver = scan_results[0]["best_ver"]
+                remote_branch = scan_results[0]["branch"]
             else:
-                ok(f"Up-to-date: v{version_str(installed_ver)}")
-        else:
-            info("Could not fetch remote version (offline?). Clone locally to check.")
-        # Print top 5 branches with scripts
-        if scan_results:
-            print(f"\n  {BLD}Top branches by version:{RST}")
-            for r in scan_results[:5]:
-                tag = " ◀ current best" if r is scan_results[0] else ""
-                print(f"    v{version_str(r['best_ver']):<10}  {r['branch']}{tag}")
-        sys.exit(0)
-
-    # ── 2. Clone latest ───────────────────────────────────────────────────────
-    hdr(f"Step 2 — Fetching latest version from [{selected_branch}]…")
-    tmp_dir    = Path(tempfile.mkdtemp(prefix="ai-cli-install-"))
-    clone_dest = tmp_dir / "ai-cli"
-
-    try:
-        clone_repo(clone_dest, branch=selected_branch, dry_run=dry)
+                remote_ver    = check_remote_version(arch)
+                remote_branch = selected_branch
+            if remote_ver > (0, 0, 0):
+                if remote_ver > installed_ver:
+                    warn(f"Update available: {version_str(installed_ver)} → "
+                         f"{version_str(remote_ver)}  [{remote_branch}]")
+                    warn("Run: python3 install.py --update")
+                else:
+                    ok(f"Up-to-date: v{version_str(installed_ver)}")
+            else:
+                info("Could not fetch remote version (offline?). Clone locally to check.")
+            # Print top 5 branches with scripts
+            if scan_results:
+                print(f"\n  {BLD}Top branches by version:{RST}")
+                for r in scan_results[:5]:
+                    tag = " ◀ current best" if r is scan_results[0] else ""
+                    print(f"    v{version_str(r['best_ver']):<10}  {r['branch']}{tag}")
+            sys.exit(0)
+
+        # ── 2. Clone latest ───────────────────────────────────────────────────
+        hdr(f"Step 2 — Fetching latest version from [{selected_branch}]…")
+        repo_dir = fetch_sources(clone_dest, branch=selected_branch,
+                                 dry_run=dry, pending=fetch_job)
 
         if dry:
             latest_ver = (2, 8, 0)
             latest     = Path(f"main-v2.8{'-arm64' if arch=='arm64' else ''}")
         else:
-            latest     = find_script_for_arch(clone_dest, arch)
+            latest     = find_script_for_arch(repo_dir, arch)
             latest_ver = parse_version(latest.name)
 
         info(f"Available:    v{version_str(latest_ver)}  ({latest.name})")
@@ -852,7 +1268,7 @@ def main():
         # ── 4. Install new build ───────────────────────────────────────────
         hdr(f"Step 4 — Installing v{version_str(latest_ver)} "
             f"[{arch_label(arch, arm_type, cpu_feats)}]…")
-        ai_bin = install_script(latest, prefix, dry_run=dry)
+        ai_bin = install_script(latest, prefix, dry_run=dry, version=latest_ver)
         ok(f"AI CLI v{version_str(latest_ver)} installed → {ai_bin}")
 
         # ── 5. Install dependencies ────────────────────────────────────────
@@ -918,7 +1334,10 @@ def main():
         print()
 
     finally:
-        if not args.keep_clone and tmp_dir.exists():
+        if fetch_job is not None and not fetch_job.done():
+            fetch_job.cancel()
+            fetch_stop.set()   # daemon thread: abandon extraction, never joined
+        if tmp_dir is not None and not args.keep_clone and tmp_dir.exists():
             if dry:
                 info(f"[dry-run] Would delete temp dir: {tmp_dir}")
             else: